@@ -11,6 +11,30 @@ Q_TABLE_PATH = os.path.join('models','q_table.pkl')
 def baseline_compatibility(sim_score, skill_overlap, location_flag, exp_norm, edu_score):
     sc = 0.6*sim_score + 0.2*(skill_overlap / 5.0) + 0.1*location_flag + 0.1*exp_norm
     return max(0.0, min(1.0, sc))
+def cosine_to_similarity(cos):
+    return max(0.0, min(1.0, (cos + 1)/2)) if np.isfinite(cos) else 0.0
+def pair_features(sim_score, skill_overlap, loc_flag, cv_meta=None, sentiment=0.0):
+    """
+    Feature dict for one CV/JD pair, shared by evaluate_candidate and run_sweep.py.
+    Callers supply the similarity, skill overlap and location flag; the rest
+    comes from cv_meta (a dict or a CSV row). The result is accepted by
+    rl_agent.decide_action: match_score, sentiment, experience_months and
+    location_match are the keys features_from_eval reads for the Q-state.
+    """
+    if cv_meta is None:
+        cv_meta = {}
+    exp = parse_experience(cv_meta.get('experience_months', 0))
+    exp_norm = min(1.0, exp / 120.0)
+    edu_score = education_score(cv_meta.get('education',''))
+    return {
+        'match_score': baseline_compatibility(sim_score, skill_overlap, loc_flag, exp_norm, edu_score),
+        'similarity': sim_score,
+        'sentiment': float(sentiment),
+        'skill_overlap': int(skill_overlap),
+        'location_match': bool(loc_flag),
+        'experience_months': exp,
+        'exp_norm': exp_norm
+    }
 def ensure_q_table():
     if os.path.exists(Q_TABLE_PATH):
         try:
@@ -31,19 +55,17 @@ def evaluate_candidate(cv_text, jd_text, cv_meta=None, jd_meta=None, feedback_te
     jd_skills = extract_skills(jd_text_clean)
     skill_overlap = len(set(cv_skills).intersection(set(jd_skills)))
     loc_flag = 1 if (str(cv_meta.get('location','')).strip().lower() == str(jd_meta.get('location','')).strip().lower()) or (str(cv_meta.get('location','')).strip().lower()=='remote') else 0
-    exp = parse_experience(cv_meta.get('experience_months', 0))
-    exp_norm = min(1.0, exp / 120.0)
-    edu_score = education_score(cv_meta.get('education',''))
     emb_cv, emb_jd = embed_corpus([cv_text_clean], [jd_text_clean])
     cos = float(np.dot(emb_cv[0], emb_jd[0]) / (np.linalg.norm(emb_cv[0]) * np.linalg.norm(emb_jd[0]) + 1e-9))
-    sim_score = max(0.0, min(1.0, (cos + 1)/2)) if np.isfinite(cos) else 0.0
-    base_score = baseline_compatibility(sim_score, skill_overlap, loc_flag, exp_norm, edu_score)
+    sim_score = cosine_to_similarity(cos)
     sentiments = [sentiment_score(t) for t in feedback_texts]
     avg_sent = float(np.mean(sentiments)) if sentiments else 0.0
+    feats = pair_features(sim_score, skill_overlap, loc_flag, cv_meta, sentiment=avg_sent)
+    exp = feats['experience_months']
+    base_score = feats['match_score']
     alignment = 1.0 - abs(avg_sent - 0.0)
     Q = ensure_q_table()
-    state = discretize_state(sim_score, avg_sent, exp_norm, loc_flag, prev_action=3)
-    action_idx, action_name = select_action_from_q(Q, state)
+    action_name = decide_action(feats, Q=Q, prev_action='HOLD')  # ACTIONS[3], as before
     explanation = [
         f'similarity: {sim_score:.3f}',
         f'skill_overlap: {skill_overlap}',
@@ -58,6 +80,9 @@ def evaluate_candidate(cv_text, jd_text, cv_meta=None, jd_meta=None, feedback_te
         'match_score': base_score,
         'similarity': sim_score,
         'sentiment': avg_sent,
+        'skill_overlap': feats['skill_overlap'],
+        'location_match': feats['location_match'],
+        'experience_months': exp,
         'alignment': alignment,
         'agent_decision': action_name,
         'explanation': explanation,
@@ -0,0 +1,66 @@
+# check_matcher.py
+"""
+Parity check: utils.matcher.score_matrix (vectorized) vs the original
+per-row scoring loop that compute_matches used before it was vectorized.
+
+Uses a fixed random similarity matrix, so no embedding model is needed.
+    python check_matcher.py        # exits 1 on any mismatch
+"""
+import os, sys
+import numpy as np
+import pandas as pd
+from utils.matcher import score_matrix
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def reference_scores(cvs_df, jds_df, sims, boost_location=0.05, boost_skill=0.05):
+    # per-pair loop, verbatim from the pre-vectorized compute_matches
+    n_jd, n_cv = sims.shape
+    overlap = np.zeros((n_jd, n_cv), dtype=int)
+    loc = np.zeros((n_jd, n_cv), dtype=int)
+    score = np.zeros((n_jd, n_cv))
+    cvs_r = cvs_df.reset_index()
+    for j_idx, jd_row in jds_df.reset_index().iterrows():
+        jd_loc = str(jd_row.get('location','')).strip().lower()
+        jd_skills = [s.strip().lower() for s in str(jd_row.get('required_skills','')).split(',') if s.strip()!='']
+        for cv_idx in range(n_cv):
+            cv_row = cvs_r.iloc[cv_idx]
+            cv_loc = str(cv_row.get('location','')).strip().lower()
+            cv_skills = [s.strip().lower() for s in str(cv_row.get('skills','')).split(',') if s.strip()!='']
+            skill_overlap = len(set(cv_skills).intersection(set(jd_skills)))
+            loc_flag = 1 if (jd_loc and cv_loc and (jd_loc==cv_loc or cv_loc=='remote' or jd_loc=='remote')) else 0
+            s = float(sims[j_idx, cv_idx]) + (boost_skill * skill_overlap) + (boost_location * loc_flag)
+            overlap[j_idx, cv_idx] = skill_overlap
+            loc[j_idx, cv_idx] = loc_flag
+            score[j_idx, cv_idx] = max(0.0, min(1.0, s))
+    return {'skill_overlap': overlap, 'location_match': loc, 'score': score}
+
+def cases():
+    cvs = pd.read_csv(os.path.join(DATA_DIR, 'sample_cvs.csv'))
+    jds = pd.read_csv(os.path.join(DATA_DIR, 'sample_jds.csv'))
+    yield 'sample data', cvs, jds
+    yield 'shifted index', cvs.set_index(cvs.index + 100), jds.set_index(jds.index + 7)
+    messy = cvs.copy()
+    messy.loc[::3, 'skills'] = np.nan
+    messy.loc[1::4, 'location'] = np.nan
+    messy.loc[2, 'location'] = ''
+    messy.loc[5, 'skills'] = ' Python , , SQL '
+    yield 'NaN/blank skills + location', messy, jds
+    yield 'no JD location column', cvs, jds.drop(columns=['location'])
+
+def main():
+    rng = np.random.default_rng(42)
+    failed = False
+    for name, cvs, jds in cases():
+        sims = rng.uniform(-0.2, 1.0, size=(len(jds), len(cvs)))
+        got = score_matrix(cvs, jds, sims=sims)
+        want = reference_scores(cvs, jds, sims)
+        ok = (np.array_equal(got['skill_overlap'], want['skill_overlap'])
+              and np.array_equal(got['location_match'], want['location_match'])
+              and np.allclose(got['score'], want['score'], rtol=0, atol=1e-12))
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name} ({len(jds)} JDs x {len(cvs)} CVs)")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
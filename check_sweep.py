@@ -0,0 +1,246 @@
+# check_sweep.py
+"""
+Checks for run_sweep.py: hire selection in sweep_jd, and checkpoint/resume
+behaviour of run_sweep in a temp directory.
+
+Embeddings are replaced by a TF-IDF fit on the tiny test corpus, and the
+Q-table is a short train_q run, so no model download is needed.
+    python check_sweep.py        # exits 1 on any failure
+"""
+import os, sys, glob, shutil, tempfile
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+import utils.matcher
+import run_sweep
+from utils.rl_agent import ACTIONS, A2I, train_q, save_q_table
+
+def _tfidf_embed(list_a, list_b):
+    X = TfidfVectorizer().fit_transform(list(list_a) + list(list_b)).toarray()
+    return X[:len(list_a)], X[len(list_a):]
+
+def _mats(base, overlap, loc):
+    base = np.array([base], dtype=float)
+    overlap = np.array([overlap])
+    loc = np.array([loc])
+    return {'base_score': base, 'skill_overlap': overlap, 'location_match': loc,
+            'score': np.clip(base + 0.05 * overlap + 0.05 * loc, 0.0, 1.0)}
+
+def _with_actions(actions):
+    # decide_action stand-in keyed on experience_months, which the cases set per CV
+    orig = run_sweep.decide_action
+    run_sweep.decide_action = lambda feats, Q=None, prev_action='REJECT': actions[feats['experience_months']]
+    return orig
+
+CVS = pd.DataFrame({'id': ['a', 'b', 'c', 'd'], 'name': ['A', 'B', 'C', 'D'],
+                    'experience_months': [0, 1, 2, 3], 'education': ['BSc'] * 4})
+JD = pd.Series({'id': 'JD_X', 'title': 'Job_X'})
+
+# ------------------------------
+# sweep_jd
+# ------------------------------
+
+def case_hire_first_rl_hire_in_shortlist():
+    # shortlist order (loc, score, skills): c, a, b, d; only b is an RL HIRE
+    mats = _mats([0.85, 0.8, 0.7, 0.95], [1, 1, 1, 0], [1, 1, 1, 0])
+    mats['score'][0, 2] = 1.0
+    orig = _with_actions({0: 'REJECT', 1: 'HIRE', 2: 'ASSIGN_TASK', 3: 'HIRE'})
+    try:
+        df = run_sweep.sweep_jd(0, JD, CVS, mats, np.zeros(4), None, top_n=4, shortlist=3)
+    finally:
+        run_sweep.decide_action = orig
+    assert df['hired'].sum() == 1
+    assert df.loc[df['hired'], 'cv_id'].tolist() == ['b']
+
+def case_hire_fallback_to_best_row():
+    # d is the only RL HIRE but falls outside shortlist=2 -> best row (c) is hired
+    mats = _mats([0.85, 0.8, 0.7, 0.95], [1, 1, 1, 0], [1, 1, 1, 0])
+    mats['score'][0, 2] = 1.0
+    orig = _with_actions({0: 'REJECT', 1: 'REJECT', 2: 'HOLD', 3: 'HIRE'})
+    try:
+        df = run_sweep.sweep_jd(0, JD, CVS, mats, np.zeros(4), None, top_n=4, shortlist=2)
+    finally:
+        run_sweep.decide_action = orig
+    assert df.loc[df['hired'], 'cv_id'].tolist() == ['c']
+    assert df['rank'].tolist() == [1, 2, 3, 4]
+    assert df['cv_id'].tolist() == ['d', 'a', 'b', 'c']
+
+def case_empty_frame():
+    empty = CVS.iloc[0:0]
+    mats = {k: np.zeros((1, 0)) for k in ('base_score', 'skill_overlap', 'location_match', 'score')}
+    df = run_sweep.sweep_jd(0, JD, empty, mats, np.zeros(0), None)
+    assert df.empty and list(df.columns) == run_sweep.COLUMNS
+
+# ------------------------------
+# run_sweep: checkpoint + resume
+# ------------------------------
+
+class _Sandbox:
+    """Temp data/, outputs/ and Q-table with run_sweep pointed at them."""
+    def __enter__(self):
+        self.dir = tempfile.mkdtemp()
+        data = os.path.join(self.dir, 'data')
+        os.makedirs(data)
+        self.saved = {k: getattr(run_sweep, k) for k in
+                      ('DATA_CVS', 'DATA_JDS', 'DATA_FEEDBACKS', 'OUTPUTS_DIR', 'latest_q_path')}
+        self.saved_embed = utils.matcher.embed_corpus
+        run_sweep.DATA_CVS = os.path.join(data, 'cvs.csv')
+        run_sweep.DATA_JDS = os.path.join(data, 'jds.csv')
+        run_sweep.DATA_FEEDBACKS = os.path.join(data, 'feedbacks.csv')
+        run_sweep.OUTPUTS_DIR = os.path.join(self.dir, 'outputs')
+        utils.matcher.embed_corpus = _tfidf_embed
+        # ids that type inference would turn into numbers
+        pd.DataFrame({
+            'id': ['12345678', '8e123456', '0000beef', 'c0ffee00'],
+            'name': ['Candidate_1', 'Candidate_2', 'Candidate_3', 'Candidate_4'],
+            'location': ['Pune', 'Remote', 'Mumbai', 'Pune'],
+            'skills': ['python,sql', 'ml,nlp', 'java,react', 'python,ml'],
+            'experience_months': [12, 48, 90, 30],
+            'education': ['BSc', 'M.Tech', 'B.Tech', 'MCA'],
+            'resume_text': ['python sql developer', 'ml nlp researcher', 'java react engineer', 'python ml analyst'],
+        }).to_csv(run_sweep.DATA_CVS, index=False)
+        pd.DataFrame({
+            'id': ['JD_1', 'JD_2', 'JD_3'], 'title': ['Job_1', 'Job_2', 'Job_3'],
+            'location': ['Pune', 'Remote', 'Mumbai'],
+            'required_skills': ['python,sql', 'ml,nlp', 'java'],
+            'description': ['python sql role', 'ml nlp role', 'java role'],
+        }).to_csv(run_sweep.DATA_JDS, index=False)
+        pd.DataFrame({'candidate_id': ['Candidate_1'], 'reviewer_role': ['recruiter'],
+                      'feedback_text': ['Good communication'], 'date': ['2025-08-10']}
+                     ).to_csv(run_sweep.DATA_FEEDBACKS, index=False)
+        self.q_path = save_q_table(train_q(episodes=50), os.path.join(self.dir, 'q_table_a.pkl'))
+        run_sweep.latest_q_path = lambda: self.q_path
+        return self
+    def __exit__(self, *exc):
+        for k, v in self.saved.items():
+            setattr(run_sweep, k, v)
+        utils.matcher.embed_corpus = self.saved_embed
+        shutil.rmtree(self.dir)
+
+def _expect_value_error(fn, fragment):
+    try:
+        fn()
+    except ValueError as e:
+        assert fragment in str(e), str(e)
+        return
+    raise AssertionError(f"expected ValueError containing {fragment!r}")
+
+def case_run_and_read_back():
+    with _Sandbox() as sb:
+        run_dir = run_sweep.run_sweep(top_n=3, shortlist=2)
+        state = run_sweep.load_checkpoint(run_dir)
+        assert state['top_n'] == 3 and state['shortlist'] == 2 and state['q_table'] == sb.q_path
+        assert sorted(state['completed']) == ['JD_1', 'JD_2', 'JD_3']
+        res = run_sweep.read_results(run_dir)
+        assert len(res) == 9 and res.groupby('jd_id')['hired'].sum().tolist() == [1, 1, 1]
+        assert set(res['cv_id']) <= {'12345678', '8e123456', '0000beef', 'c0ffee00'}
+        assert not glob.glob(os.path.join(run_dir, '**', '*.tmp'), recursive=True)
+
+def case_resume_skips_completed():
+    with _Sandbox() as sb:
+        run_dir = run_sweep.run_sweep(top_n=2, shortlist=1)
+        first = run_sweep.read_results(run_dir)
+        state = run_sweep.load_checkpoint(run_dir)
+        state['completed'].remove('JD_2')
+        run_sweep.save_checkpoint(run_dir, state)
+        os.remove(os.path.join(run_dir, 'jd_id=JD_2', run_sweep.PARTITION_FILE))
+        kept = os.path.join(run_dir, 'jd_id=JD_1', run_sweep.PARTITION_FILE)
+        before = os.stat(kept).st_mtime_ns
+        # a newer Q-table (always HOLD) must not leak into the resumed run
+        hold = [0.0] * len(ACTIONS)
+        hold[A2I['HOLD']] = 1.0
+        states = [(m, s, e, l, p) for m in range(10) for s in range(5) for e in range(4)
+                  for l in range(2) for p in range(len(ACTIONS))]
+        q_b = save_q_table({st: list(hold) for st in states}, os.path.join(sb.dir, 'q_table_b.pkl'))
+        run_sweep.latest_q_path = lambda: q_b
+        run_sweep.run_sweep(run_dir=run_dir)
+        assert os.stat(kept).st_mtime_ns == before
+        state = run_sweep.load_checkpoint(run_dir)
+        assert sorted(state['completed']) == ['JD_1', 'JD_2', 'JD_3'] and state['q_table'] == sb.q_path
+        res = run_sweep.read_results(run_dir)
+        assert len(res) == 6
+        redone = res[res['jd_id'] == 'JD_2'].drop(columns='timestamp').reset_index(drop=True)
+        assert redone.equals(first[first['jd_id'] == 'JD_2'].drop(columns='timestamp').reset_index(drop=True))
+
+def case_read_results_keeps_ids_as_strings():
+    run_dir = tempfile.mkdtemp()
+    try:
+        df = pd.DataFrame({'jd_id': ['101', '101'], 'cv_id': ['12345678', '00001234']})
+        run_sweep.write_partition(run_dir, '101', df)
+        run_sweep.write_partition(run_dir, '102', df.assign(jd_id='102', cv_id=['8e123456', '1e000001']))
+        res = run_sweep.read_results(run_dir)
+        assert res['cv_id'].tolist() == ['12345678', '00001234', '8e123456', '1e000001'], res['cv_id'].tolist()
+        assert res['jd_id'].tolist() == ['101', '101', '102', '102']
+    finally:
+        shutil.rmtree(run_dir)
+
+def case_resume_refuses_mismatch():
+    with _Sandbox() as sb:
+        run_dir = run_sweep.run_sweep(top_n=2, shortlist=1)
+        _expect_value_error(lambda: run_sweep.run_sweep(run_dir=run_dir, top_n=3), 'top_n=3')
+        _expect_value_error(lambda: run_sweep.run_sweep(run_dir=run_dir, shortlist=2), 'shortlist=2')
+        run_sweep.run_sweep(run_dir=run_dir, top_n=2, shortlist=1)  # matching flags are fine
+
+        with open(run_sweep.DATA_JDS, 'a') as f:
+            f.write('JD_4,Job_4,Pune,python,python role\n')
+        _expect_value_error(lambda: run_sweep.run_sweep(run_dir=run_dir), 'jds')
+
+def case_resume_refuses_missing_q_table():
+    with _Sandbox() as sb:
+        run_dir = run_sweep.run_sweep(top_n=2, shortlist=1)
+        os.remove(sb.q_path)
+        _expect_value_error(lambda: run_sweep.run_sweep(run_dir=run_dir), 'no longer exists')
+
+def case_resume_refuses_incomplete_checkpoint():
+    with _Sandbox() as sb:
+        run_dir = run_sweep.run_sweep(top_n=2, shortlist=1)
+        state = run_sweep.load_checkpoint(run_dir)
+        del state['q_table'], state['inputs']
+        run_sweep.save_checkpoint(run_dir, state)
+        _expect_value_error(lambda: run_sweep.run_sweep(run_dir=run_dir), 'q_table, inputs')
+
+def case_partition_write_is_atomic():
+    with _Sandbox() as sb:
+        run_dir = run_sweep.run_sweep(top_n=2, shortlist=1)
+        path = os.path.join(run_dir, 'jd_id=JD_1', run_sweep.PARTITION_FILE)
+        with open(path) as f:
+            before = f.read()
+        class Broken:
+            def to_csv(self, p, index=False):
+                with open(p, 'w') as f:
+                    f.write('jd_id,cv_')
+                raise OSError('disk full')
+        try:
+            run_sweep.write_partition(run_dir, 'JD_1', Broken())
+        except OSError:
+            pass
+        with open(path) as f:
+            assert f.read() == before
+
+CASES = [
+    case_hire_first_rl_hire_in_shortlist,
+    case_hire_fallback_to_best_row,
+    case_empty_frame,
+    case_run_and_read_back,
+    case_read_results_keeps_ids_as_strings,
+    case_resume_skips_completed,
+    case_resume_refuses_mismatch,
+    case_resume_refuses_missing_q_table,
+    case_resume_refuses_incomplete_checkpoint,
+    case_partition_write_is_atomic,
+]
+
+def main():
+    failed = False
+    for case in CASES:
+        try:
+            case()
+            ok, msg = True, ''
+        except AssertionError as e:
+            ok, msg = False, f': {e}'
+        failed |= not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {case.__name__[5:]}{msg}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
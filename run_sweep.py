@@ -0,0 +1,271 @@
+# run_sweep.py
+"""
+In-process bulk hiring sweep: matching, evaluation and RL decisions for every
+JD in one pass (replaces the per-JD HTTP loop in run_demo.ps1).
+
+Usage:
+    python run_sweep.py                       # new run under outputs/sweep_<ts>/
+    python run_sweep.py --resume outputs/sweep_20250815_134447
+    python run_sweep.py --top-n 20 --shortlist 5
+
+Output is one result set partitioned by JD:
+    outputs/sweep_<ts>/jd_id=<JD>/decisions.csv   (top-N rows with rl_action + hired flag)
+    outputs/sweep_<ts>/_checkpoint.json           (run params, Q-table, input files, JDs done)
+
+The only heavy step is score_matrix (one embedding pass for the whole
+JD x CV grid). Per-JD work is a few dozen decide_action calls, so JDs run
+sequentially: a thread pool gains nothing under the GIL, and a process pool
+costs more to start than the work it would split.
+"""
+import os, json, argparse
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from app.app_utils import cosine_to_similarity, pair_features
+from utils.matcher import score_matrix
+from utils.rl_agent import latest_q_path, load_q_table, decide_action
+from utils.sentiment import process_feedbacks
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DATA_CVS = os.path.join(ROOT, "data", "sample_cvs.csv")
+DATA_JDS = os.path.join(ROOT, "data", "sample_jds.csv")
+DATA_FEEDBACKS = os.path.join(ROOT, "data", "sample_feedbacks.csv")
+OUTPUTS_DIR = os.path.join(ROOT, "outputs")
+CHECKPOINT_FILE = "_checkpoint.json"
+PARTITION_FILE = "decisions.csv"
+DEFAULT_TOP_N = 20
+DEFAULT_SHORTLIST = 5
+CHECKPOINT_KEYS = ["top_n", "shortlist", "q_table", "inputs", "completed"]
+COLUMNS = ["jd_id", "jd_title", "cv_id", "cv_name", "rank", "base_score", "score", "skill_overlap",
+           "location_match", "match_score", "sentiment", "rl_action", "decision_source", "hired", "timestamp"]
+
+# ------------------------------
+# Checkpointing
+# ------------------------------
+
+def load_checkpoint(run_dir):
+    path = os.path.join(run_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(run_dir, state):
+    # write-then-rename so a killed run never leaves a half-written checkpoint
+    path = os.path.join(run_dir, CHECKPOINT_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+def _input_fingerprint():
+    """
+    Size + mtime of each input CSV (None if absent), so --resume can tell
+    whether the data changed under an interrupted run.
+    """
+    out = {}
+    for key, path in (("cvs", DATA_CVS), ("jds", DATA_JDS), ("feedbacks", DATA_FEEDBACKS)):
+        if os.path.exists(path):
+            st = os.stat(path)
+            out[key] = {"path": path, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        else:
+            out[key] = None
+    return out
+
+def resolve_state(run_dir, top_n=None, shortlist=None):
+    """
+    Load the run's checkpoint, or build one for a new run. A new run pins
+    top_n/shortlist (defaults if None), the newest Q-table and the input
+    fingerprints. On resume, raises ValueError if any of those no longer
+    hold, so one result set never mixes partitions built differently.
+    """
+    state = load_checkpoint(run_dir) if os.path.isdir(run_dir) else None
+    if state is None:
+        return {"top_n": DEFAULT_TOP_N if top_n is None else top_n,
+                "shortlist": DEFAULT_SHORTLIST if shortlist is None else shortlist,
+                "q_table": latest_q_path(),
+                "inputs": _input_fingerprint(),
+                "completed": []}
+    missing = [k for k in CHECKPOINT_KEYS if k not in state]
+    if missing:
+        raise ValueError(f"{run_dir} checkpoint has no {', '.join(missing)}; start a new sweep")
+    for key, val in (("top_n", top_n), ("shortlist", shortlist)):
+        if val is not None and val != state[key]:
+            raise ValueError(f"{key}={val} does not match {key}={state[key]} stored in {run_dir}")
+    if state["q_table"] is not None and not os.path.exists(state["q_table"]):
+        raise ValueError(f"Q-table {state['q_table']} used by {run_dir} no longer exists")
+    changed = [k for k, v in _input_fingerprint().items() if v != state["inputs"].get(k)]
+    if changed:
+        raise ValueError(f"input data changed since {run_dir} started: {', '.join(changed)}")
+    return state
+
+def write_partition(run_dir, jd_id, df):
+    part_dir = os.path.join(run_dir, f"jd_id={jd_id}")
+    os.makedirs(part_dir, exist_ok=True)
+    path = os.path.join(part_dir, PARTITION_FILE)
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return path
+
+def read_results(run_dir):
+    """
+    Load every partition of a sweep back into one DataFrame.
+    """
+    frames = []
+    for name in sorted(os.listdir(run_dir)):
+        path = os.path.join(run_dir, name, PARTITION_FILE)
+        if name.startswith("jd_id=") and os.path.exists(path) and os.path.getsize(path) > 0:
+            frames.append(pd.read_csv(path, dtype={"jd_id": str, "cv_id": str}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+# ------------------------------
+# Per-JD evaluation + decision
+# ------------------------------
+
+def _feedback_sentiment(cvs, feedbacks):
+    """
+    Average feedback sentiment per CV row (0.0 when there is no feedback).
+    Feedback is keyed by candidate_id, which may hold either the CV id or name.
+    """
+    if feedbacks is None or feedbacks.empty:
+        return np.zeros(len(cvs))
+    agg = process_feedbacks(feedbacks).set_index("candidate_id")["avg_sentiment"].to_dict()
+    return np.array([
+        float(agg.get(cv_id, agg.get(name, 0.0)))
+        for cv_id, name in zip(cvs["id"], cvs.get("name", cvs["id"]))
+    ])
+
+def sweep_jd(j_idx, jd_row, cvs, mats, sentiments, Q, top_n=DEFAULT_TOP_N, shortlist=DEFAULT_SHORTLIST):
+    """
+    Rank CVs for one JD, evaluate + RL-decide the top_n and pick one hire
+    from the shortlist (first RL "HIRE", else best by location/score/skills).
+
+    Features go through app_utils.pair_features, same as evaluate_candidate
+    (and so /decide), and decide_action builds the Q-state from the same
+    keys. The inputs follow the matcher (utils.matcher.score_matrix), so
+    rl_action can still differ from /decide for the same pair:
+      - similarity comes from score_matrix's single embedding pass over
+        the raw texts; /evaluate embeds the clean_text()-ed pair on its own.
+        It feeds match_score, and so the match-score bin;
+      - skill_overlap uses the CSV skills/required_skills columns, not
+        extract_skills() on the resume/JD text; it feeds match_score;
+      - location_match also counts a "remote" JD, not only a "remote" CV;
+        it is the location bin and feeds match_score;
+      - sentiment is looked up by CV id, then by CV name (the sample
+        feedback is keyed by name; the API only tries the id, so it gets 0),
+        which changes the sentiment bin.
+    Experience and the previous action ("REJECT", as in /decide) match.
+    """
+    ranked = np.argsort(mats["base_score"][j_idx])[::-1][:top_n]
+    src = "RL" if Q is not None else "RULE_FALLBACK"
+    stamp = datetime.utcnow().isoformat()
+    rows = []
+    for rank, cv_idx in enumerate(ranked, start=1):
+        cv_row = cvs.iloc[cv_idx]
+        cos = float(mats["base_score"][j_idx, cv_idx])
+        eval_result = pair_features(cosine_to_similarity(cos),
+                                    mats["skill_overlap"][j_idx, cv_idx],
+                                    mats["location_match"][j_idx, cv_idx],
+                                    cv_row, sentiment=sentiments[cv_idx])
+        rows.append({
+            "jd_id": jd_row["id"],
+            "jd_title": jd_row.get("title", ""),
+            "cv_id": cv_row["id"],
+            "cv_name": cv_row.get("name", ""),
+            "rank": rank,
+            "base_score": cos,
+            "score": float(mats["score"][j_idx, cv_idx]),
+            "skill_overlap": eval_result["skill_overlap"],
+            "location_match": eval_result["location_match"],
+            "match_score": eval_result["match_score"],
+            "sentiment": eval_result["sentiment"],
+            "rl_action": decide_action(eval_result, Q=Q, prev_action="REJECT"),
+            "decision_source": src,
+            "hired": False,
+            "timestamp": stamp,
+        })
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    if df.empty:
+        return df
+    top = df.sort_values(["location_match", "score", "skill_overlap"], ascending=False).head(shortlist)
+    rl_hires = top[top["rl_action"] == "HIRE"]
+    pick = rl_hires.index[0] if not rl_hires.empty else top.index[0]
+    df.loc[pick, "hired"] = True
+    return df
+
+# ------------------------------
+# Driver
+# ------------------------------
+
+def run_sweep(run_dir=None, top_n=None, shortlist=None):
+    """
+    Sweep every JD into run_dir (a new outputs/sweep_<ts>/ if None).
+    Parameters, Q-table and inputs are pinned by resolve_state; see there.
+    """
+    if run_dir is None:
+        run_dir = os.path.join(OUTPUTS_DIR, f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    state = resolve_state(run_dir, top_n=top_n, shortlist=shortlist)
+    top_n, shortlist = state["top_n"], state["shortlist"]
+    if top_n < 1 or shortlist < 1:
+        raise ValueError("top_n and shortlist must be >= 1")
+    os.makedirs(run_dir, exist_ok=True)
+    save_checkpoint(run_dir, state)
+
+    cvs = pd.read_csv(DATA_CVS).reset_index(drop=True)
+    jds = pd.read_csv(DATA_JDS).reset_index(drop=True)
+    feedbacks = pd.read_csv(DATA_FEEDBACKS) if os.path.exists(DATA_FEEDBACKS) else None
+
+    done = set(state["completed"])
+    todo = [j for j, jd_id in enumerate(jds["id"]) if jd_id not in done]
+    print(f"Sweep dir: {run_dir}  (top_n={top_n}, shortlist={shortlist})")
+    print(f"JDs: {len(jds)} (done: {len(done)}, todo: {len(todo)})  CVs: {len(cvs)}")
+    if not todo:
+        return run_dir
+
+    # one embedding + scoring pass for the whole JD x CV grid
+    mats = score_matrix(cvs, jds)
+    sentiments = _feedback_sentiment(cvs, feedbacks)
+    # None -> rule fallback, same as the API
+    Q = load_q_table(state["q_table"]) if state["q_table"] else None
+
+    for j in todo:
+        jd_id = jds.iloc[j]["id"]
+        df = sweep_jd(j, jds.iloc[j], cvs, mats, sentiments, Q, top_n, shortlist)
+        write_partition(run_dir, jd_id, df)
+        state["completed"].append(jd_id)
+        save_checkpoint(run_dir, state)
+        hired = df[df["hired"]] if not df.empty else df
+        if hired.empty:
+            print(f"[{jd_id}] no candidates")
+        else:
+            h = hired.iloc[0]
+            print(f"[{jd_id}] HIRE {h['cv_id']} | Score: {h['score']:.3f} | RL: {h['rl_action']} ({h['decision_source']})")
+    return run_dir
+
+def _positive_int(val):
+    n = int(val)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {n}")
+    return n
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk hiring sweep over all JDs.")
+    ap.add_argument("--resume", metavar="RUN_DIR", help="continue an interrupted sweep in RUN_DIR")
+    ap.add_argument("--top-n", type=_positive_int,
+                    help=f"candidates evaluated per JD (default {DEFAULT_TOP_N}, or the resumed run's value)")
+    ap.add_argument("--shortlist", type=_positive_int,
+                    help=f"candidates considered for the hire (default {DEFAULT_SHORTLIST}, or the resumed run's value)")
+    args = ap.parse_args()
+    if args.resume and not os.path.exists(os.path.join(args.resume, CHECKPOINT_FILE)):
+        ap.error(f"no {CHECKPOINT_FILE} in {args.resume}")
+    try:
+        run_dir = run_sweep(run_dir=args.resume, top_n=args.top_n, shortlist=args.shortlist)
+    except ValueError as e:
+        ap.error(str(e))
+    results = read_results(run_dir)
+    print(f"Saved {len(results)} rows ({int(results['hired'].sum()) if not results.empty else 0} hires) to: {run_dir}")
+
+if __name__ == "__main__":
+    main()
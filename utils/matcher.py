@@ -2,38 +2,64 @@ import os, numpy as np, pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
 from datetime import datetime
 from .embedding import embed_corpus
+def _split_skills(val):
+    return [s.strip().lower() for s in str(val).split(',') if s.strip()!='']
+def _location_flags(cv_locs, jd_locs):
+    # (n_jd, n_cv) 0/1 matrix: same city, or either side remote
+    cv_l = np.array([str(l).strip().lower() for l in cv_locs], dtype=object)
+    jd_l = np.array([str(l).strip().lower() for l in jd_locs], dtype=object)
+    cv_set = (cv_l != '')[None, :]
+    jd_set = (jd_l != '')[:, None]
+    same = jd_l[:, None] == cv_l[None, :]
+    remote = (jd_l == 'remote')[:, None] | (cv_l == 'remote')[None, :]
+    return (jd_set & cv_set & (same | remote)).astype(int)
+def score_matrix(cvs_df, jds_df, boost_location=0.05, boost_skill=0.05, sims=None):
+    """
+    Vectorized scoring of every JD against every CV in one pass.
+    Returns a dict of (n_jd, n_cv) arrays: base_score (cosine), skill_overlap,
+    location_match and score (boosted, clipped to [0,1]).
+    sims: optional precomputed (n_jd, n_cv) cosine matrix; skips the embedding.
+    """
+    if sims is None:
+        cv_texts = cvs_df['resume_text'].astype(str).tolist()
+        jd_texts = (jds_df['description'].astype(str).fillna('') + ' ' + jds_df['required_skills'].astype(str)).tolist()
+        emb_cv, emb_jd = embed_corpus(cv_texts, jd_texts)
+        sims = cosine_similarity(emb_jd, emb_cv)
+    cv_skills = [_split_skills(v) for v in cvs_df.get('skills', pd.Series([''] * len(cvs_df))).tolist()]
+    jd_skills = [_split_skills(v) for v in jds_df.get('required_skills', pd.Series([''] * len(jds_df))).tolist()]
+    vocab = {s: i for i, s in enumerate(sorted(set().union(*cv_skills, *jd_skills)))}
+    cv_onehot = np.zeros((len(cv_skills), len(vocab)), dtype=np.int32)
+    jd_onehot = np.zeros((len(jd_skills), len(vocab)), dtype=np.int32)
+    for i, skills in enumerate(cv_skills):
+        cv_onehot[i, [vocab[s] for s in skills]] = 1
+    for i, skills in enumerate(jd_skills):
+        jd_onehot[i, [vocab[s] for s in skills]] = 1
+    skill_overlap = jd_onehot @ cv_onehot.T
+    loc_flag = _location_flags(cvs_df.get('location', pd.Series([''] * len(cvs_df))).tolist(),
+                               jds_df.get('location', pd.Series([''] * len(jds_df))).tolist())
+    score = np.clip(sims + boost_skill * skill_overlap + boost_location * loc_flag, 0.0, 1.0)
+    return {'base_score': sims, 'skill_overlap': skill_overlap, 'location_match': loc_flag, 'score': score}
 def compute_matches(cvs_df, jds_df, top_k=5, boost_location=0.05, boost_skill=0.05, save_csv=True):
-    cv_texts = cvs_df['resume_text'].astype(str).tolist()
-    jd_texts = (jds_df['description'].astype(str).fillna('') + ' ' + jds_df['required_skills'].astype(str)).tolist()
-    emb_cv, emb_jd = embed_corpus(cv_texts, jd_texts)
-    sims = cosine_similarity(emb_jd, emb_cv)
+    mats = score_matrix(cvs_df, jds_df, boost_location=boost_location, boost_skill=boost_skill)
+    sims = mats['base_score']
+    cvs_r = cvs_df.reset_index()
     rows = []
     for j_idx, jd_row in jds_df.reset_index().iterrows():
         jd_id = jd_row['id']
-        jd_loc = str(jd_row.get('location','')).strip().lower()
-        jd_skills = [s.strip().lower() for s in str(jd_row.get('required_skills','')).split(',') if s.strip()!='']
         row = sims[j_idx]
         ranked = np.argsort(row)[::-1][:top_k]
         for rank, cv_idx in enumerate(ranked, start=1):
-            base_score = float(row[cv_idx])
-            cv_row = cvs_df.reset_index().iloc[cv_idx]
-            cv_id = cv_row['id']
-            cv_loc = str(cv_row.get('location','')).strip().lower()
-            cv_skills = [s.strip().lower() for s in str(cv_row.get('skills','')).split(',') if s.strip()!='']
-            skill_overlap = len(set(cv_skills).intersection(set(jd_skills)))
-            loc_flag = 1 if (jd_loc and cv_loc and (jd_loc==cv_loc or cv_loc=='remote' or jd_loc=='remote')) else 0
-            score = base_score + (boost_skill * skill_overlap) + (boost_location * loc_flag)
-            score = max(0.0, min(1.0, score))
+            cv_row = cvs_r.iloc[cv_idx]
             rows.append({
                 'timestamp': datetime.utcnow().isoformat(),
                 'jd_id': jd_id,
                 'jd_title': jd_row.get('title',''),
-                'cv_id': cv_id,
+                'cv_id': cv_row['id'],
                 'cv_name': cv_row.get('name',''),
-                'base_score': base_score,
-                'skill_overlap': skill_overlap,
-                'location_match': loc_flag,
-                'score': score,
+                'base_score': float(row[cv_idx]),
+                'skill_overlap': int(mats['skill_overlap'][j_idx, cv_idx]),
+                'location_match': int(mats['location_match'][j_idx, cv_idx]),
+                'score': float(mats['score'][j_idx, cv_idx]),
                 'rank': rank
             })
     df = pd.DataFrame(rows)